@@ -1,19 +1,42 @@
-import os
 import hashlib
 import hmac
-from functools import wraps
+from functools import lru_cache, wraps
 from flask import request, jsonify
+from app.utils.config import env_config
+
+def _hash_key(api_key):
+    """Return the SHA-256 digest of an API key"""
+    return hashlib.sha256(api_key.encode('utf-8')).digest()
+
+@lru_cache(maxsize=1024)
+def _verify(valid_hashes, digest):
+    """Check an API key digest against the set of valid key digests (memoized per digest)"""
+    # Compare against every candidate so timing doesn't depend on which key matched
+    matched = False
+    for candidate in valid_hashes:
+        matched |= hmac.compare_digest(candidate, digest)
+    return matched
 
 class APIKeyAuth:
     def __init__(self):
         # In production, these should be stored in a database
         # For now, we'll use environment variables
-        self.valid_api_keys = self._load_api_keys()
+        api_keys = self._load_api_keys()
+        
+        # Index keys by digest; lookups (and the _verify cache) only ever see digests
+        self.key_info_by_hash = {_hash_key(key): info for key, info in api_keys.items()}
+        self.valid_hashes = frozenset(
+            key_hash for key_hash, info in self.key_info_by_hash.items() if info.get('active', False)
+        )
+        
+        # Digest prefixes act as a tiny exact-match filter that rejects unknown keys
+        # before the constant-time compare, and keeps them out of the _verify cache
+        self.hash_prefixes = frozenset(key_hash[:8] for key_hash in self.valid_hashes)
     
     def _load_api_keys(self):
         """Load valid API keys from environment variables"""
-        api_keys_env = os.environ.get('VALID_API_KEYS', '')
-        if not api_keys_env:
+        keys = env_config().api_keys
+        if not keys:
             # No API keys configured - this will cause all requests to fail
             # This is intentional for security - you MUST configure VALID_API_KEYS
             raise ValueError(
@@ -22,18 +45,12 @@ class APIKeyAuth:
                 "Example: VALID_API_KEYS=your-secret-key-1,your-secret-key-2"
             )
         
-        # Parse comma-separated API keys from environment
         api_keys = {}
-        for key in api_keys_env.split(','):
-            key = key.strip()
-            if key:
-                # Validate API key format for security
-                if len(key) < 16:
-                    raise ValueError(f"API key too short: {key[:8]}... (minimum 16 characters required)")
-                api_keys[key] = {'name': 'Client', 'active': True}
-        
-        if not api_keys:
-            raise ValueError("No valid API keys found in VALID_API_KEYS environment variable")
+        for key in keys:
+            # Validate API key format for security
+            if len(key) < 16:
+                raise ValueError(f"API key too short: {key[:8]}... (minimum 16 characters required)")
+            api_keys[key] = {'name': 'Client', 'active': True}
         
         return api_keys
     
@@ -42,12 +59,18 @@ class APIKeyAuth:
         if not api_key:
             return False
         
-        key_info = self.valid_api_keys.get(api_key)
-        return key_info and key_info.get('active', False)
+        return self.is_valid_digest(_hash_key(api_key))
+    
+    def is_valid_digest(self, digest):
+        """Check if an API key digest (see _hash_key) belongs to a valid and active key"""
+        if digest[:8] not in self.hash_prefixes:
+            return False
+        
+        return _verify(self.valid_hashes, digest)
     
     def get_key_info(self, api_key):
         """Get information about an API key"""
-        return self.valid_api_keys.get(api_key, {})
+        return self.key_info_by_hash.get(_hash_key(api_key), {})
 
 # Global instance
 auth = APIKeyAuth()
@@ -65,14 +88,17 @@ def require_api_key(f):
                 'message': 'Please provide a valid API key in the X-API-Key header'
             }), 401
         
-        if not auth.is_valid_key(api_key):
+        # Hash the key once and reuse the digest for validation and lookup
+        digest = _hash_key(api_key)
+        
+        if not auth.is_valid_digest(digest):
             return jsonify({
                 'error': 'Invalid API key',
                 'message': 'The provided API key is invalid or inactive'
             }), 401
         
         # Add API key info to request context for use in the endpoint
-        request.api_key_info = auth.get_key_info(api_key)
+        request.api_key_info = auth.key_info_by_hash.get(digest, {})
         
         return f(*args, **kwargs)
     
@@ -1,24 +1,101 @@
-import os
-import boto3
+import html
+import json
+from functools import lru_cache
 from botocore.exceptions import ClientError, NoCredentialsError
-from datetime import datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from app.utils.config import env_config
+
+# Static HTML email skeleton, built once at import. Only the placeholders are
+# filled in per message.
+_HTML_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>New Customer Inquiry</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f8f9fa; }}
+        .container {{ max-width: 600px; margin: 0 auto; background-color: white; }}
+        .header {{ background: linear-gradient(135deg, #4a4a4a 0%, #2c2c2c 100%); color: white; padding: 30px 20px; text-align: center; }}
+        .content {{ padding: 30px; }}
+        .intro {{ font-size: 16px; margin-bottom: 25px; color: #555; }}
+        .details {{ background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; }}
+        .field {{ margin-bottom: 15px; }}
+        .field-label {{ font-weight: 600; color: #333; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; }}
+        .field-value {{ margin-top: 5px; font-size: 16px; color: #555; padding: 8px 0; border-bottom: 1px solid #e9ecef; }}
+        .footer {{ background-color: #f8f9fa; padding: 20px; text-align: center; font-size: 14px; color: #6c757d; }}
+        .timestamp {{ font-style: italic; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 style="margin: 0; font-weight: 300;">New Form Submission</h1>
+        </div>
+        <div class="content">
+            <div class="intro">
+                <strong>{customer_name}</strong> has reached out to you through {source_url}. Here are the details of their form submission:
+            </div>
+            <div class="details">
+"""
+
+_HTML_FIELD = """
+                <div class="field">
+                    <div class="field-label">{label}:</div>
+                    <div class="field-value">{value}</div>
+                </div>
+"""
+
+_HTML_TAIL = """
+            </div>
+        </div>
+        <div class="footer">
+            <div class="timestamp">Received on {timestamp}</div>
+            <div style="margin-top: 10px;">
+                <em>This inquiry was sent through your website contact form.</em>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# SES accepts at most 50 destinations per SendBulkTemplatedEmail call
+_MAX_BULK_DESTINATIONS = 50
+
+@lru_cache(maxsize=1)
+def _ses_client():
+    """Shared SES client, created on first use (AWS_REGION is automatically provided by Lambda)"""
+    # boto3 is imported here so cold starts that never send email don't pay for it
+    import boto3
+    from botocore.config import Config
+    
+    # The larger connection pool avoids "Connection pool is full" warnings on bursty traffic
+    return boto3.client(
+        'ses',
+        region_name=env_config().aws_region,
+        config=Config(
+            max_pool_connections=50,
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        )
+    )
 
 class EmailHandler:
     def __init__(self):
-        # AWS SES configuration (AWS_REGION is automatically provided by Lambda)
-        self.aws_region = os.environ.get('AWS_REGION', 'us-east-1')
-        self.ses_client = boto3.client('ses', region_name=self.aws_region)
+        # AWS SES configuration
+        self.aws_region = env_config().aws_region
         
         # Default sender email - should be verified in SES
-        self.default_sender = os.environ.get('SES_DEFAULT_SENDER', 'noreply@example.com')
+        self.default_sender = env_config().ses_sender
         
-        # Verify SES configuration
-        try:
-            self.ses_client.get_send_quota()
-        except NoCredentialsError:
-            raise ValueError("AWS credentials not configured. Please configure AWS credentials.")
-        except Exception as e:
-            print(f"Warning: Could not verify SES configuration: {str(e)}")
+        # SES template for bulk sends, see publish_bulk_template()
+        self.bulk_template_name = env_config().ses_template_name
+    
+    @property
+    def ses_client(self):
+        return _ses_client()
     
     def send_form_email(self, form_data):
         """Send form submission via AWS SES"""
@@ -27,58 +104,32 @@ class EmailHandler:
             to_email = form_data.get('to_email')
             from_email = form_data.get('from_email', self.default_sender)
             form_fields = form_data.get('fields', {})
+            subject = self._generate_subject(form_fields, form_data)
             
-            # Create a more professional, less spammy subject line
-            customer_name = form_fields.get('name', 'Website Visitor')
-            source_url = form_data.get('source_url', '')
-            source_domain = source_url.split('/')[2] if source_url and len(source_url.split('/')) > 2 else 'your website'
-            
-            default_subject = f"New Form Submission from {customer_name} via {source_domain}"
-            subject = form_data.get('subject', default_subject)
-            
-            # Generate email content
-            html_body = self._generate_email_body(form_fields, form_data)
-            text_body = self._generate_text_body(form_fields)
+            # Generate email content, with the same timestamp in both bodies
+            timestamp_human, timestamp_iso = self._generate_timestamps()
+            html_body = self._generate_email_body(form_fields, form_data, timestamp_human)
+            text_body = self._generate_text_body(form_fields, timestamp_iso)
             
             # Prepare sender with proper name
-            sender_name = "Contact Form"
-            formatted_source = f"{sender_name} <{from_email}>"
+            formatted_source = self._format_source(from_email)
             
             # Add reply-to if customer provided email
-            reply_to_addresses = []
-            customer_email = form_fields.get('email')
-            if customer_email and '@' in customer_email:
-                reply_to_addresses = [customer_email]
+            reply_to_addresses = self._reply_to_addresses(form_fields)
             
-            # Send email using SES
-            ses_params = {
-                'Source': formatted_source,
-                'Destination': {
-                    'ToAddresses': [to_email]
-                },
-                'Message': {
-                    'Subject': {
-                        'Data': subject,
-                        'Charset': 'UTF-8'
-                    },
+            # Send email using SES (an empty ReplyToAddresses list means no reply-to)
+            response = self.ses_client.send_email(
+                Source=formatted_source,
+                Destination={'ToAddresses': [to_email]},
+                Message={
+                    'Subject': {'Data': subject, 'Charset': 'UTF-8'},
                     'Body': {
-                        'Html': {
-                            'Data': html_body,
-                            'Charset': 'UTF-8'
-                        },
-                        'Text': {
-                            'Data': text_body,
-                            'Charset': 'UTF-8'
-                        }
+                        'Html': {'Data': html_body, 'Charset': 'UTF-8'},
+                        'Text': {'Data': text_body, 'Charset': 'UTF-8'}
                     }
-                }
-            }
-            
-            # Add reply-to if available
-            if reply_to_addresses:
-                ses_params['ReplyToAddresses'] = reply_to_addresses
-            
-            response = self.ses_client.send_email(**ses_params)
+                },
+                ReplyToAddresses=reply_to_addresses
+            )
             
             return {
                 'success': True,
@@ -86,114 +137,263 @@ class EmailHandler:
                 'message': 'Email sent successfully via AWS SES'
             }
                 
+        except NoCredentialsError:
+            return {
+                'success': False,
+                'error': 'AWS credentials not configured. Please configure AWS credentials.'
+            }
         except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            
-            # Handle specific SES errors
-            if error_code == 'MessageRejected':
-                return {
-                    'success': False,
-                    'error': f'Email rejected: {error_message}'
-                }
-            elif error_code == 'MailFromDomainNotVerified':
-                return {
+            return self._client_error_result(e)
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Unexpected error: {str(e)}'
+            }
+    
+    def send_bulk_form_emails(self, form_data_list):
+        """Send several form submissions, batching them into SendBulkTemplatedEmail calls where possible"""
+        results = [None] * len(form_data_list)
+        
+        # Group submissions by sender, since Source is shared by every destination in a bulk call
+        batches = {}
+        for index, form_data in enumerate(form_data_list):
+            # A malformed submission only fails itself, never the rest of the batch
+            try:
+                form_fields = form_data.get('fields', {})
+                
+                # Reply-to is also per call, so submissions that need one are sent individually
+                if not self.bulk_template_name or self._reply_to_addresses(form_fields):
+                    results[index] = self.send_form_email(form_data)
+                else:
+                    source = self._format_source(form_data.get('from_email', self.default_sender))
+                    batches.setdefault(source, []).append(index)
+            except Exception as e:
+                results[index] = {
                     'success': False,
-                    'error': f'Sender domain not verified: {error_message}'
+                    'error': f'Unexpected error: {str(e)}'
                 }
-            elif error_code == 'ConfigurationSetDoesNotExist':
-                return {
+        
+        for source, indexes in batches.items():
+            for start in range(0, len(indexes), _MAX_BULK_DESTINATIONS):
+                chunk = indexes[start:start + _MAX_BULK_DESTINATIONS]
+                chunk_results = self._send_bulk_chunk(source, [form_data_list[i] for i in chunk])
+                for index, result in zip(chunk, chunk_results):
+                    results[index] = result
+        
+        return results
+    
+    def _send_bulk_chunk(self, source, form_data_list):
+        """Send up to 50 submissions from one sender in a single SES call"""
+        results = [None] * len(form_data_list)
+        
+        # Build each destination separately, so one bad submission can't fail the chunk
+        timestamps = self._generate_timestamps()
+        sent_indexes = []
+        destinations = []
+        for index, form_data in enumerate(form_data_list):
+            try:
+                destinations.append({
+                    'Destination': {
+                        'ToAddresses': [form_data.get('to_email')]
+                    },
+                    'ReplacementTemplateData': json.dumps(self._generate_template_data(form_data, *timestamps))
+                })
+                sent_indexes.append(index)
+            except Exception as e:
+                results[index] = {
                     'success': False,
-                    'error': f'Configuration set error: {error_message}'
+                    'error': f'Unexpected error: {str(e)}'
                 }
+        
+        if not destinations:
+            return results
+        
+        sent_form_data = [form_data_list[i] for i in sent_indexes]
+        try:
+            response = self.ses_client.send_bulk_templated_email(
+                Source=source,
+                Template=self.bulk_template_name,
+                Destinations=destinations,
+                DefaultTemplateData='{}'
+            )
+        except NoCredentialsError:
+            sent_results = [{
+                'success': False,
+                'error': 'AWS credentials not configured. Please configure AWS credentials.'
+            }] * len(sent_indexes)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'TemplateDoesNotExist':
+                # Template not published for this stage/region yet; don't fail the batch over it
+                print(f"Warning: SES template {self.bulk_template_name} does not exist, sending individually")
+                sent_results = [self.send_form_email(form_data) for form_data in sent_form_data]
             else:
-                return {
-                    'success': False,
-                    'error': f'AWS SES error ({error_code}): {error_message}'
-                }
+                sent_results = [self._client_error_result(e)] * len(sent_indexes)
         except Exception as e:
-            return {
+            sent_results = [{
                 'success': False,
                 'error': f'Unexpected error: {str(e)}'
+            }] * len(sent_indexes)
+        else:
+            sent_results = self._bulk_status_results(response)
+        
+        for index, result in zip(sent_indexes, sent_results):
+            results[index] = result
+        
+        return results
+    
+    def _bulk_status_results(self, response):
+        """Convert a SendBulkTemplatedEmail response into per-destination send results"""
+        # SES reports a status per destination, in request order
+        results = []
+        for status in response['Status']:
+            if status['Status'] == 'Success':
+                results.append({
+                    'success': True,
+                    'email_id': status['MessageId'],
+                    'message': 'Email sent successfully via AWS SES'
+                })
+            else:
+                results.append({
+                    'success': False,
+                    'error': f"AWS SES error ({status['Status']}): {status.get('Error', '')}"
+                })
+        
+        return results
+    
+    def publish_bulk_template(self):
+        """Create or update the SES template used by send_bulk_form_emails (run at deploy time)"""
+        if not self.bulk_template_name:
+            raise ValueError("SES_TEMPLATE_NAME must be set to publish the bulk email template")
+        
+        # Same markup as _generate_email_body, with SES placeholders for the dynamic parts.
+        # Triple braces insert values verbatim; _generate_template_data escapes them itself.
+        template = {
+            'TemplateName': self.bulk_template_name,
+            'SubjectPart': '{{{subject}}}',
+            'HtmlPart': (
+                _HTML_HEAD.format(customer_name='{{{customer_name}}}', source_url='{{{source_url}}}')
+                + '{{{fields_html}}}'
+                + _HTML_TAIL.format(timestamp='{{{timestamp}}}')
+            ),
+            'TextPart': '{{{text_body}}}'
+        }
+        
+        try:
+            self.ses_client.update_template(Template=template)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TemplateDoesNotExist':
+                raise
+            self.ses_client.create_template(Template=template)
+    
+    def _generate_subject(self, form_fields, form_data):
+        """Generate the subject line, unless the form provided one"""
+        # Create a more professional, less spammy subject line
+        customer_name = form_fields.get('name', 'Website Visitor')
+        source_domain = self._source_domain(form_data.get('source_url')) or 'your website'
+        
+        default_subject = f"New Form Submission from {customer_name} via {source_domain}"
+        return form_data.get('subject', default_subject)
+    
+    def _source_domain(self, source_url):
+        """Host part of the submitting page's URL, or '' if it can't be parsed"""
+        if not isinstance(source_url, str):
+            return ''
+        
+        # urlsplit raises on some URLs _validate_url accepts, e.g. "http://[bad"
+        try:
+            return urlsplit(source_url).netloc
+        except ValueError:
+            return ''
+    
+    def _format_source(self, from_email):
+        """Format the sender address with a display name"""
+        sender_name = "Contact Form"
+        return f"{sender_name} <{from_email}>"
+    
+    def _reply_to_addresses(self, form_fields):
+        """Reply to the customer if they provided an email address"""
+        customer_email = form_fields.get('email')
+        if isinstance(customer_email, str) and '@' in customer_email:
+            return [customer_email]
+        return []
+    
+    def _client_error_result(self, e):
+        """Convert an SES ClientError into a failed send result"""
+        error_code = e.response['Error']['Code']
+        error_message = e.response['Error']['Message']
+        
+        # Handle specific SES errors
+        if error_code == 'MessageRejected':
+            return {
+                'success': False,
+                'error': f'Email rejected: {error_message}'
             }
+        elif error_code == 'MailFromDomainNotVerified':
+            return {
+                'success': False,
+                'error': f'Sender domain not verified: {error_message}'
+            }
+        elif error_code == 'ConfigurationSetDoesNotExist':
+            return {
+                'success': False,
+                'error': f'Configuration set error: {error_message}'
+            }
+        else:
+            return {
+                'success': False,
+                'error': f'AWS SES error ({error_code}): {error_message}'
+            }
+    
+    def _generate_timestamps(self):
+        """Format the current UTC time for the HTML and plain text bodies"""
+        now = datetime.now(timezone.utc)
+        return now.strftime("%B %d, %Y at %I:%M %p UTC"), now.strftime("%Y-%m-%d %H:%M:%S UTC")
+    
+    def _generate_template_data(self, form_data, timestamp_human, timestamp_iso):
+        """Generate the replacement data for the bulk SES template"""
+        form_fields = form_data.get('fields', {})
+        
+        return {
+            'subject': self._generate_subject(form_fields, form_data),
+            'customer_name': html.escape(str(form_fields.get('name', 'A potential customer'))),
+            'source_url': html.escape(str(form_data.get('source_url', 'your website'))),
+            'fields_html': self._generate_fields_html(form_fields, form_data),
+            'text_body': self._generate_text_body(form_fields, timestamp_iso),
+            'timestamp': timestamp_human
+        }
     
-    def _generate_email_body(self, form_fields, form_data):
+    def _generate_email_body(self, form_fields, form_data, timestamp):
         """Generate professional HTML email body"""
-        timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p UTC")
-        customer_name = form_fields.get('name', 'A potential customer')
-        source_url = form_data.get('source_url', 'your website')
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>New Customer Inquiry</title>
-            <style>
-                body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #333; background-color: #f8f9fa; }}
-                .container {{ max-width: 600px; margin: 0 auto; background-color: white; }}
-                .header {{ background: linear-gradient(135deg, #4a4a4a 0%, #2c2c2c 100%); color: white; padding: 30px 20px; text-align: center; }}
-                .content {{ padding: 30px; }}
-                .intro {{ font-size: 16px; margin-bottom: 25px; color: #555; }}
-                .details {{ background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; }}
-                .field {{ margin-bottom: 15px; }}
-                .field-label {{ font-weight: 600; color: #333; font-size: 14px; text-transform: uppercase; letter-spacing: 0.5px; }}
-                .field-value {{ margin-top: 5px; font-size: 16px; color: #555; padding: 8px 0; border-bottom: 1px solid #e9ecef; }}
-                .footer {{ background-color: #f8f9fa; padding: 20px; text-align: center; font-size: 14px; color: #6c757d; }}
-                .timestamp {{ font-style: italic; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1 style="margin: 0; font-weight: 300;">New Form Submission</h1>
-                </div>
-                <div class="content">
-                    <div class="intro">
-                        <strong>{customer_name}</strong> has reached out to you through {source_url}. Here are the details of their form submission:
-                    </div>
-                    <div class="details">
-        """
-        
-        # Add form fields
-        for field_name, field_value in form_fields.items():
-            if field_value:  # Only include non-empty fields
-                html += f"""
-                <div class="field">
-                    <div class="field-label">{field_name.replace('_', ' ').title()}:</div>
-                    <div class="field-value">{str(field_value)}</div>
-                </div>
-                """
+        # Escape user-provided values so they can't inject markup into the email
+        customer_name = html.escape(str(form_fields.get('name', 'A potential customer')))
+        source_url = html.escape(str(form_data.get('source_url', 'your website')))
+        
+        return (
+            _HTML_HEAD.format(customer_name=customer_name, source_url=source_url)
+            + self._generate_fields_html(form_fields, form_data)
+            + _HTML_TAIL.format(timestamp=timestamp)
+        )
+    
+    def _generate_fields_html(self, form_fields, form_data):
+        """Generate the HTML blocks for each submitted field"""
+        # Add form fields (only non-empty ones)
+        fields = [
+            _HTML_FIELD.format(
+                label=html.escape(field_name.replace('_', ' ').title()),
+                value=html.escape(str(field_value))
+            )
+            for field_name, field_value in form_fields.items()
+            if field_value
+        ]
         
         # Add metadata
         if form_data.get('source_url'):
-            html += f"""
-            <div class="field">
-                <div class="field-label">Source URL:</div>
-                <div class="field-value">{form_data['source_url']}</div>
-            </div>
-            """
-        
-        html += f"""
-                    </div>
-                </div>
-                <div class="footer">
-                    <div class="timestamp">Received on {timestamp}</div>
-                    <div style="margin-top: 10px;">
-                        <em>This inquiry was sent through your website contact form.</em>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+            fields.append(_HTML_FIELD.format(label='Source URL', value=html.escape(str(form_data['source_url']))))
         
-        return html
+        return ''.join(fields)
     
-    def _generate_text_body(self, form_fields):
+    def _generate_text_body(self, form_fields, timestamp):
         """Generate plain text email body from form fields"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-        
         text = "NEW FORM SUBMISSION\n"
         text += "=" * 30 + "\n\n"
         
@@ -0,0 +1,48 @@
+import json
+from functools import lru_cache
+from botocore.exceptions import ClientError, NoCredentialsError
+from app.utils.config import env_config
+
+@lru_cache(maxsize=1)
+def _sqs_client():
+    """Shared SQS client, created on first use"""
+    # boto3 is imported here so cold starts that never queue email don't pay for it
+    import boto3
+    return boto3.client('sqs', region_name=env_config().aws_region)
+
+class QueueHandler:
+    def __init__(self):
+        # SQS queue consumed by the email worker Lambda
+        self.queue_url = env_config().email_queue_url
+    
+    def enqueue_form_email(self, form_data):
+        """Queue a validated form submission for delivery by the email worker"""
+        try:
+            response = _sqs_client().send_message(
+                QueueUrl=self.queue_url,
+                MessageBody=json.dumps(form_data)
+            )
+            
+            return {
+                'success': True,
+                'message_id': response['MessageId'],
+                'message': 'Form submission queued for delivery'
+            }
+        
+        except NoCredentialsError:
+            return {
+                'success': False,
+                'error': 'AWS credentials not configured. Please configure AWS credentials.'
+            }
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            return {
+                'success': False,
+                'error': f'AWS SQS error ({error_code}): {error_message}'
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Unexpected error: {str(e)}'
+            }
\ No newline at end of file
@@ -1,24 +1,71 @@
 import os
+import json
+from functools import lru_cache
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from app.handlers.email_handler import EmailHandler
+from app.handlers.queue_handler import QueueHandler
 from app.auth.api_key_auth import require_api_key
 from app.utils.validation import validate_form_data
 from app.utils.rate_limiter import RateLimiter
+from app.utils.config import env_config
+
+# orjson is a compiled extension; if the installed wheel doesn't match the
+# platform (e.g. packaged on macOS for Lambda), fall back to Flask's JSON
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, which is several times faster than the stdlib json module"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# The health check body never changes, so serialize it once
+_HEALTH_RESPONSE = (
+    json.dumps({"status": "healthy", "service": "mayfly-forms"}, separators=(',', ':')),
+    200,
+    {"Content-Type": "application/json"}
+)
+
+# Services are process-wide singletons so warm Lambda invocations (and any
+# repeated create_app() call) reuse them. Call cache_clear() to reset in tests.
+@lru_cache(maxsize=1)
+def _get_email_handler():
+    return EmailHandler()
+
+@lru_cache(maxsize=1)
+def _get_rate_limiter():
+    return RateLimiter()
+
+@lru_cache(maxsize=1)
+def _get_queue_handler():
+    # Queue emails for the worker Lambda when EMAIL_QUEUE_URL is set,
+    # otherwise send synchronously (e.g. local development)
+    return QueueHandler() if env_config().email_queue_url else None
 
 def create_app():
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
     
     # Enable CORS for all domains
     CORS(app, origins="*", methods=["POST", "OPTIONS"])
     
     # Initialize services
-    email_handler = EmailHandler()
-    rate_limiter = RateLimiter()
+    email_handler = _get_email_handler()
+    rate_limiter = _get_rate_limiter()
+    queue_handler = _get_queue_handler()
     
     @app.route('/health', methods=['GET'])
     def health_check():
-        return jsonify({"status": "healthy", "service": "mayfly-forms"})
+        return _HEALTH_RESPONSE
     
     @app.route('/submit-form', methods=['POST'])
     @require_api_key
@@ -32,7 +79,7 @@ def create_app():
                 return jsonify({"error": "Rate limit exceeded"}), 429
             
             # Validate request data
-            form_data = request.get_json()
+            form_data = request.get_json(silent=True)
             if not form_data:
                 return jsonify({"error": "No JSON data provided"}), 400
             
@@ -40,6 +87,18 @@ def create_app():
             if not validation_result['valid']:
                 return jsonify({"error": validation_result['message']}), 400
             
+            # Queue email for delivery by the worker
+            if queue_handler:
+                result = queue_handler.enqueue_form_email(form_data)
+                
+                if result['success']:
+                    return jsonify({
+                        "message": "Form submitted successfully",
+                        "queue_message_id": result['message_id']
+                    }), 202
+                else:
+                    return jsonify({"error": result['error']}), 500
+            
             # Send email
             result = email_handler.send_form_email(form_data)
             
@@ -0,0 +1,25 @@
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+EnvConfig = namedtuple('EnvConfig', ['aws_region', 'ses_sender', 'api_keys', 'email_queue_url', 'ses_template_name'])
+
+@lru_cache(maxsize=1)
+def env_config() -> EnvConfig:
+    """Read environment configuration once per process"""
+    # Parse comma-separated API keys, dropping blanks
+    api_keys = tuple(
+        key.strip() for key in os.environ.get('VALID_API_KEYS', '').split(',') if key.strip()
+    )
+    
+    return EnvConfig(
+        # AWS_REGION is automatically provided by Lambda
+        aws_region=os.environ.get('AWS_REGION', 'us-east-1'),
+        # Default sender email - should be verified in SES
+        ses_sender=os.environ.get('SES_DEFAULT_SENDER', 'noreply@example.com'),
+        api_keys=api_keys,
+        # When set, submissions are queued for email_worker instead of sent inline
+        email_queue_url=os.environ.get('EMAIL_QUEUE_URL') or None,
+        # SES template used by email_worker for bulk sends
+        ses_template_name=os.environ.get('SES_TEMPLATE_NAME') or None
+    )
\ No newline at end of file
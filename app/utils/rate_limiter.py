@@ -1,11 +1,45 @@
+import threading
 import time
-from typing import Dict, Tuple, Optional
-from collections import defaultdict, deque
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
+
+# Most clients tracked at once; the least recently seen are forgotten beyond this
+MAX_CLIENTS = 10000
+
+# Seconds between idle-client cleanups, run from the request path
+CLEANUP_INTERVAL = 900
+
+# Clients idle for this long have refilled every bucket and can be forgotten
+MAX_IDLE_SECONDS = 24 * 3600
+
+class _LRUDict(OrderedDict):
+    """OrderedDict that drops its least recently used entries beyond max_size"""
+    
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        self._evict()
+    
+    def _evict(self):
+        while len(self) > self.max_size:
+            self.popitem(last=False)
 
 class RateLimiter:
     def __init__(self):
-        # Store request timestamps for each client (IP + API key combination)
-        self.requests = defaultdict(deque)
+        # One token bucket per time window for each client (IP + API key combination).
+        # Each bucket is a (tokens, last_refill) pair, in the same order as self.limits.
+        # Bounded so that traffic from many distinct IPs can't grow memory without limit.
+        self.buckets: Dict[str, List[Tuple[float, float]]] = _LRUDict(MAX_CLIENTS)
+        self._lock = threading.Lock()
         
         # Rate limiting configuration
         self.limits = {
@@ -20,6 +54,18 @@ class RateLimiter:
             'per_hour': 3600,
             'per_day': 86400
         }
+        
+        # Limits and refill rates (tokens per second) used for both enforcement and
+        # reporting, precomputed so the hot path avoids dict lookups and division
+        self._lim_min = self.limits['per_minute']
+        self._lim_hour = self.limits['per_hour']
+        self._lim_day = self.limits['per_day']
+        self._rate_min = self._lim_min / self.windows['per_minute']
+        self._rate_hour = self._lim_hour / self.windows['per_hour']
+        self._rate_day = self._lim_day / self.windows['per_day']
+        
+        # Periodically drop idle clients for long-lived processes (e.g. warm Lambda containers)
+        self._last_cleanup = time.time()
     
     def is_allowed(self, client_ip: str, api_key: Optional[str] = None) -> bool:
         """Check if a request is allowed based on rate limits"""
@@ -31,35 +77,75 @@ class RateLimiter:
         
         current_time = time.time()
         
-        # Clean old requests and check limits
+        # Refill buckets and check limits
         return self._check_and_update_limits(client_id, current_time)
     
+    def _refill(self, client_id: str, current_time: float) -> List[Tuple[float, float]]:
+        """Return the client's buckets topped up for the time elapsed since the last refill"""
+        buckets = self.buckets.get(client_id)
+        if buckets is None:
+            # New clients start with full buckets
+            return [(float(limit), current_time) for limit in self._bucket_limits()]
+        
+        refilled = []
+        for (tokens, last_refill), limit, rate in zip(buckets, self._bucket_limits(), self._bucket_rates()):
+            # Tokens come back at limit/window per second, capped at the limit
+            tokens = min(limit, tokens + (current_time - last_refill) * rate)
+            refilled.append((tokens, current_time))
+        
+        return refilled
+    
+    def _bucket_limits(self) -> Tuple[int, int, int]:
+        """Limits in bucket order, as enforced by _check_and_update_limits"""
+        return (self._lim_min, self._lim_hour, self._lim_day)
+    
+    def _bucket_rates(self) -> Tuple[float, float, float]:
+        """Refill rates in bucket order, as enforced by _check_and_update_limits"""
+        return (self._rate_min, self._rate_hour, self._rate_day)
+    
     def _check_and_update_limits(self, client_id: str, current_time: float) -> bool:
-        """Check rate limits and update request log"""
-        client_requests = self.requests[client_id]
-        
-        # Check each time window
-        for limit_type, limit_count in self.limits.items():
-            window_seconds = self.windows[limit_type]
-            cutoff_time = current_time - window_seconds
+        """Check rate limits and consume a token from every bucket"""
+        with self._lock:
+            if current_time - self._last_cleanup > CLEANUP_INTERVAL:
+                self._last_cleanup = current_time
+                self._remove_idle_clients(current_time - MAX_IDLE_SECONDS)
             
-            # Remove old requests outside the time window
-            while client_requests and client_requests[0] < cutoff_time:
-                client_requests.popleft()
+            buckets = self.buckets.get(client_id)
+            if buckets is None:
+                # New clients start with full buckets
+                min_tokens, hour_tokens, day_tokens = self._lim_min, self._lim_hour, self._lim_day
+                min_refill = hour_refill = day_refill = current_time
+            else:
+                (min_tokens, min_refill), (hour_tokens, hour_refill), (day_tokens, day_refill) = buckets
             
-            # Check if we've exceeded the limit
-            if len(client_requests) >= limit_count:
-                return False
-        
-        # If all limits are okay, record this request
-        client_requests.append(current_time)
-        
-        # Keep memory usage reasonable by limiting stored requests
-        max_stored_requests = max(self.limits.values())
-        while len(client_requests) > max_stored_requests:
-            client_requests.popleft()
-        
-        return True
+            # Refill and check the tightest window first, so bursts are rejected fastest
+            min_tokens = min(self._lim_min, min_tokens + (current_time - min_refill) * self._rate_min)
+            if min_tokens < 1:
+                return self._reject(client_id)
+            
+            hour_tokens = min(self._lim_hour, hour_tokens + (current_time - hour_refill) * self._rate_hour)
+            if hour_tokens < 1:
+                return self._reject(client_id)
+            
+            day_tokens = min(self._lim_day, day_tokens + (current_time - day_refill) * self._rate_day)
+            if day_tokens < 1:
+                return self._reject(client_id)
+            
+            # If all limits are okay, record this request
+            self.buckets[client_id] = [
+                (min_tokens - 1, current_time),
+                (hour_tokens - 1, current_time),
+                (day_tokens - 1, current_time)
+            ]
+            
+            return True
+    
+    def _reject(self, client_id: str) -> bool:
+        """Refuse a request without changing the client's buckets"""
+        # Still counts as recent use, so rate-limited clients aren't the first to be evicted
+        if client_id in self.buckets:
+            self.buckets.move_to_end(client_id)
+        return False
     
     def get_remaining_requests(self, client_ip: str, api_key: Optional[str] = None) -> Dict[str, int]:
         """Get remaining requests for each time window"""
@@ -68,17 +154,12 @@ class RateLimiter:
         
         client_id = f"{client_ip}:{api_key}" if api_key else client_ip
         current_time = time.time()
-        client_requests = self.requests[client_id]
+        buckets = self._refill(client_id, current_time)
         
         remaining = {}
         
-        for limit_type, limit_count in self.limits.items():
-            window_seconds = self.windows[limit_type]
-            cutoff_time = current_time - window_seconds
-            
-            # Count requests in this time window
-            recent_requests = sum(1 for req_time in client_requests if req_time >= cutoff_time)
-            remaining[limit_type] = max(0, limit_count - recent_requests)
+        for limit_type, (tokens, _) in zip(self.limits, buckets):
+            remaining[limit_type] = int(tokens)
         
         return remaining
     
@@ -89,27 +170,13 @@ class RateLimiter:
         
         client_id = f"{client_ip}:{api_key}" if api_key else client_ip
         current_time = time.time()
-        client_requests = self.requests[client_id]
+        buckets = self._refill(client_id, current_time)
         
         reset_times = {}
         
-        for limit_type, window_seconds in self.windows.items():
-            if client_requests:
-                # Find the oldest request in this window
-                cutoff_time = current_time - window_seconds
-                oldest_in_window = None
-                
-                for req_time in client_requests:
-                    if req_time >= cutoff_time:
-                        oldest_in_window = req_time
-                        break
-                
-                if oldest_in_window:
-                    reset_times[limit_type] = oldest_in_window + window_seconds
-                else:
-                    reset_times[limit_type] = current_time
-            else:
-                reset_times[limit_type] = current_time
+        for limit_type, (tokens, _), limit, rate in zip(self.limits, buckets, self._bucket_limits(), self._bucket_rates()):
+            # Time at which the bucket will be full again
+            reset_times[limit_type] = current_time + (limit - tokens) / rate
         
         return reset_times
     
@@ -118,16 +185,18 @@ class RateLimiter:
         current_time = time.time()
         cutoff_time = current_time - (max_age_hours * 3600)
         
-        clients_to_remove = []
-        
-        for client_id, requests in self.requests.items():
-            # Remove old requests
-            while requests and requests[0] < cutoff_time:
-                requests.popleft()
-            
-            # Remove client if no recent requests
-            if not requests:
-                clients_to_remove.append(client_id)
+        with self._lock:
+            self._last_cleanup = current_time
+            self._remove_idle_clients(cutoff_time)
+    
+    def _remove_idle_clients(self, cutoff_time: float):
+        """Drop clients last seen before cutoff_time; caller must hold self._lock"""
+        # A client idle for a full day has refilled every bucket, so forgetting
+        # it is equivalent to keeping it
+        clients_to_remove = [
+            client_id for client_id, buckets in self.buckets.items()
+            if buckets[0][1] < cutoff_time
+        ]
         
         for client_id in clients_to_remove:
-            del self.requests[client_id]
\ No newline at end of file
+            del self.buckets[client_id]
\ No newline at end of file
@@ -1,13 +1,83 @@
 import re
+import string
+from email.utils import parseaddr
+from functools import lru_cache
 from typing import Dict, Any, List
 
+# Precompiled patterns used on every form submission
+_URL_RE = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_CTRL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+# Any control character, including tab and newlines, which never belong in an address
+_EMAIL_CTRL_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+# Characters allowed in an unquoted local part (RFC 5322 atext), and in domain labels (LDH)
+_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "!#$%&'*+-/=?^_`{|}~")
+_DOMAIN_LABEL_CHARS = frozenset(string.ascii_letters + string.digits + '-')
+# Quoted local parts may not contain these, so the address stays safe inside "Name <addr>"
+_QUOTED_LOCAL_UNSAFE = frozenset('"\\<>')
+
+# Longest address allowed (64-character local part + @ + 255-character domain)
+_MAX_EMAIL_LENGTH = 320
+# URLs longer than this are still validated, just not cached
+_MAX_CACHED_URL_LENGTH = 2048
+
+# Common injection patterns. Plain substrings are checked with `in`, which is
+# much cheaper than a regex scan; only the patterns that need regex features
+# fall through to _SUSPICIOUS_RE.
+_LITERAL_SUSPICIOUS = ('javascript:', 'document.', 'window.', '<iframe', '<object', '<embed')
+_SUSPICIOUS_RE = re.compile(r'<script[^>]*>|eval\s*\(|on\w+\s*=', re.IGNORECASE)
+# Every _SUSPICIOUS_RE match contains at least one of these characters
+_SUSPICIOUS_RE_CHARS = ('<', '(', '=')
+
 def validate_email(email: str) -> bool:
     """Validate email address format"""
-    if not email or not isinstance(email, str):
+    if not email or not isinstance(email, str) or len(email) > _MAX_EMAIL_LENGTH:
         return False
     
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(email_pattern, email) is not None
+    return _validate_email_cached(email)
+
+@lru_cache(maxsize=2048)
+def _validate_email_cached(email: str) -> bool:
+    """Check an email address's structure, memoized since clients resubmit the same addresses"""
+    # SES only accepts 7-bit ASCII addresses, and control characters are never valid
+    if not email.isascii() or _EMAIL_CTRL_RE.search(email):
+        return False
+    
+    # Only accept a single bare address, not "Name <addr>" or a list of addresses
+    name, addr = parseaddr(email)
+    if name or addr != email:
+        return False
+    
+    local, _, domain = addr.rpartition('@')
+    if not local or not domain:
+        return False
+    
+    # Either a quoted local part ("john smith"@example.com) or dot-separated atoms
+    if len(local) > 1 and local.startswith('"') and local.endswith('"'):
+        quoted = local[1:-1]
+        if not quoted or any(char in _QUOTED_LOCAL_UNSAFE for char in quoted):
+            return False
+    elif not all(atom and _LOCAL_CHARS.issuperset(atom) for atom in local.split('.')):
+        return False
+    
+    # Domain needs at least two letter/digit/hyphen labels (internationalized domains
+    # must be sent as Punycode) and an alphabetic or Punycode top-level domain
+    labels = domain.split('.')
+    if len(labels) < 2 or not all(_valid_domain_label(label) for label in labels):
+        return False
+    
+    tld = labels[-1]
+    return (len(tld) >= 2 and tld.isalpha()) or tld.lower().startswith('xn--')
+
+def _valid_domain_label(label: str) -> bool:
+    """Check a domain label against the letter-digit-hyphen hostname rules"""
+    return (
+        0 < len(label) <= 63
+        and _DOMAIN_LABEL_CHARS.issuperset(label)
+        and not label.startswith('-')
+        and not label.endswith('-')
+    )
 
 def validate_form_data(form_data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate form submission data"""
@@ -31,65 +101,51 @@ def validate_form_data(form_data: Dict[str, Any]) -> Dict[str, Any]:
             'message': f'Missing required fields: {", ".join(missing_fields)}'
         }
     
-    # Validate to_email
-    to_email = form_data.get('to_email')
-    if not validate_email(str(to_email) if to_email else ''):
-        return {
-            'valid': False,
-            'message': 'Invalid to_email format'
-        }
+    # Collect every problem so clients can fix them in one round-trip
+    errors = []
+    
+    # Validate to_email (guaranteed non-empty by the required fields check)
+    if not validate_email(form_data['to_email']):
+        errors.append('Invalid to_email format')
     
     # Validate from_email if provided
     from_email = form_data.get('from_email')
-    if from_email and not validate_email(str(from_email)):
-        return {
-            'valid': False,
-            'message': 'Invalid from_email format'
-        }
+    if from_email and not validate_email(from_email):
+        errors.append('Invalid from_email format')
     
-    # Validate fields
-    fields = form_data.get('fields')
+    # Validate fields (guaranteed non-empty by the required fields check)
+    fields = form_data['fields']
     if not isinstance(fields, dict):
-        return {
-            'valid': False,
-            'message': 'Fields must be a JSON object'
-        }
-    
-    if not fields:
-        return {
-            'valid': False,
-            'message': 'At least one form field is required'
-        }
-    
-    # Validate field content
-    for field_name, field_value in fields.items():
-        if not isinstance(field_name, str):
-            return {
-                'valid': False,
-                'message': 'Field names must be strings'
-            }
-        
-        # Check for potentially dangerous content
-        if _contains_suspicious_content(str(field_value)):
-            return {
-                'valid': False,
-                'message': f'Suspicious content detected in field: {field_name}'
-            }
+        errors.append('Fields must be a JSON object')
+    else:
+        # Validate field content
+        for field_name, field_value in fields.items():
+            if not isinstance(field_name, str):
+                errors.append('Field names must be strings')
+                continue
+            
+            # Check for potentially dangerous content
+            str_value = field_value if isinstance(field_value, str) else str(field_value)
+            if _contains_suspicious_content(str_value):
+                errors.append(f'Suspicious content detected in field: {field_name}')
     
     # Validate subject if provided
     subject = form_data.get('subject', '')
     if subject and len(subject) > 200:
-        return {
-            'valid': False,
-            'message': 'Subject line too long (max 200 characters)'
-        }
+        errors.append('Subject line too long (max 200 characters)')
     
     # Validate source_url if provided
     source_url = form_data.get('source_url')
-    if source_url and not _validate_url(source_url):
+    if source_url is not None and not isinstance(source_url, str):
+        errors.append('source_url must be a string')
+    elif source_url and not _validate_url(source_url):
+        errors.append('Invalid source_url format')
+    
+    if errors:
         return {
             'valid': False,
-            'message': 'Invalid source_url format'
+            'message': '; '.join(errors),
+            'errors': errors
         }
     
     return {
@@ -98,38 +154,31 @@ def validate_form_data(form_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 def _contains_suspicious_content(content: str) -> bool:
-    """Check for potentially malicious content"""
-    if not isinstance(content, str):
-        return False
-    
-    # Check for common injection patterns
-    suspicious_patterns = [
-        r'<script[^>]*>',
-        r'javascript:',
-        r'on\w+\s*=',
-        r'eval\s*\(',
-        r'document\.',
-        r'window\.',
-        r'<iframe',
-        r'<object',
-        r'<embed'
-    ]
-    
+    """Check a string for potentially malicious content"""
     content_lower = content.lower()
+    if any(token in content_lower for token in _LITERAL_SUSPICIOUS):
+        return True
     
-    for pattern in suspicious_patterns:
-        if re.search(pattern, content_lower, re.IGNORECASE):
-            return True
+    if not any(char in content for char in _SUSPICIOUS_RE_CHARS):
+        return False
     
-    return False
+    return _SUSPICIOUS_RE.search(content) is not None
 
 def _validate_url(url: str) -> bool:
     """Validate URL format"""
     if not url or not isinstance(url, str):
         return False
     
-    url_pattern = r'^https?://[^\s/$.?#].[^\s]*$'
-    return re.match(url_pattern, url) is not None
+    # Keep oversized URLs out of the cache
+    if len(url) > _MAX_CACHED_URL_LENGTH:
+        return _URL_RE.match(url) is not None
+    
+    return _validate_url_cached(url)
+
+@lru_cache(maxsize=2048)
+def _validate_url_cached(url: str) -> bool:
+    """Match a URL, memoized since forms are submitted from the same pages"""
+    return _URL_RE.match(url) is not None
 
 def sanitize_field_value(value: Any) -> str:
     """Sanitize field value for safe email inclusion"""
@@ -140,9 +189,9 @@ def sanitize_field_value(value: Any) -> str:
     str_value = str(value)[:1000]  # Limit to 1000 characters
     
     # Remove potentially dangerous HTML tags
-    str_value = re.sub(r'<[^>]+>', '', str_value)
+    str_value = _HTML_TAG_RE.sub('', str_value)
     
     # Remove null bytes and control characters
-    str_value = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', str_value)
+    str_value = _CTRL_RE.sub('', str_value)
     
     return str_value.strip()
\ No newline at end of file
@@ -30,8 +30,9 @@ else
     echo "   You may want to set it with: export SES_DEFAULT_SENDER=your-verified-email@example.com"
 fi
 
-# Get deployment stage (default to 'dev')
+# Get deployment stage (default to 'dev') and region (default matches serverless.yml)
 STAGE=${1:-dev}
+REGION=${REGION:-us-east-2}
 
 echo "📦 Installing Serverless Framework if not installed..."
 if ! command -v serverless &> /dev/null; then
@@ -44,13 +45,17 @@ if [ ! -d node_modules ]; then
 fi
 npm install serverless-python-requirements
 
-echo "📤 Deploying to AWS Lambda (stage: $STAGE)..."
-serverless deploy --stage $STAGE
+echo "📤 Deploying to AWS Lambda (stage: $STAGE, region: $REGION)..."
+serverless deploy --stage $STAGE --region $REGION
+
+# Template name must match SES_TEMPLATE_NAME in serverless.yml
+echo "📧 Publishing SES email template..."
+AWS_REGION=$REGION SES_TEMPLATE_NAME="mayfly-forms-api-$STAGE-form-submission" python3 publish_ses_template.py
 
 echo "✅ Deployment complete!"
 echo "📋 API Info:"
-serverless info --stage $STAGE
+serverless info --stage $STAGE --region $REGION
 
 echo ""
 echo "🔗 Your API is ready! Test it with:"
-echo "curl -X GET https://\$(serverless info --stage $STAGE | grep ServiceEndpoint | cut -d' ' -f2)/health"
\ No newline at end of file
+echo "curl -X GET https://\$(serverless info --stage $STAGE --region $REGION | grep ServiceEndpoint | cut -d' ' -f2)/health"
\ No newline at end of file
@@ -0,0 +1,31 @@
+import json
+from app.handlers.email_handler import EmailHandler
+
+# The bulk SES template (SES_TEMPLATE_NAME) is published at deploy time
+# by publish_ses_template.py
+email_handler = EmailHandler()
+
+def lambda_handler(event, context):
+    """AWS Lambda handler for queued form submissions (SQS trigger)"""
+    batch_item_failures = []
+    records = []
+    form_data_list = []
+    
+    for record in event.get('Records', []):
+        try:
+            form_data_list.append(json.loads(record['body']))
+            records.append(record)
+        except ValueError as e:
+            print(f"Failed to parse queued email {record.get('messageId')}: {str(e)}")
+            batch_item_failures.append({'itemIdentifier': record['messageId']})
+    
+    # Send the whole batch, using SES bulk sends where possible
+    results = email_handler.send_bulk_form_emails(form_data_list)
+    
+    for record, result in zip(records, results):
+        if not result['success']:
+            # Failed records are retried by SQS; the rest of the batch is deleted
+            print(f"Failed to send queued email {record.get('messageId')}: {result['error']}")
+            batch_item_failures.append({'itemIdentifier': record['messageId']})
+    
+    return {'batchItemFailures': batch_item_failures}
\ No newline at end of file
@@ -1,8 +1,13 @@
-import serverless_wsgi
-from app.main import create_app
-
-app = create_app()
+# The Flask app is built on the first invocation rather than at import, so the
+# cold start only loads what the first request actually needs
+_app = None
 
 def lambda_handler(event, context):
     """AWS Lambda handler function"""
-    return serverless_wsgi.handle_request(app, event, context)
\ No newline at end of file
+    global _app
+    if _app is None:
+        from app.main import create_app
+        _app = create_app()
+    
+    import serverless_wsgi
+    return serverless_wsgi.handle_request(_app, event, context)
\ No newline at end of file
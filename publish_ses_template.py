@@ -0,0 +1,10 @@
+# Creates or updates the SES template the email worker uses for bulk sends.
+# Run at deploy time (deploy.sh does this) with AWS_REGION and SES_TEMPLATE_NAME
+# matching the deployed stage, e.g.:
+#   AWS_REGION=us-east-2 SES_TEMPLATE_NAME=mayfly-forms-api-dev-form-submission python3 publish_ses_template.py
+from app.handlers.email_handler import EmailHandler
+
+if __name__ == '__main__':
+    email_handler = EmailHandler()
+    email_handler.publish_bulk_template()
+    print(f"Published SES template {email_handler.bulk_template_name} in {email_handler.aws_region}")
\ No newline at end of file
@@ -0,0 +1,150 @@
+import unittest
+
+from botocore.stub import ANY, Stubber
+
+from app.handlers.email_handler import EmailHandler
+
+
+def _form_data(to_email='owner@example.com', **fields):
+    fields.setdefault('name', 'Jane')
+    return {'to_email': to_email, 'fields': fields}
+
+
+def _bulk_params(source, count):
+    return {
+        'Source': source,
+        'Template': 'form-submission',
+        'Destinations': [ANY] * count,
+        'DefaultTemplateData': '{}'
+    }
+
+
+def _bulk_response(*statuses):
+    return {'Status': [
+        {'Status': status, 'MessageId': f'bulk-{index}'} if status == 'Success'
+        else {'Status': status, 'Error': 'rejected'}
+        for index, status in enumerate(statuses)
+    ]}
+
+
+class SendBulkFormEmailsTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = EmailHandler()
+        self.handler.default_sender = 'noreply@example.com'
+        self.handler.bulk_template_name = 'form-submission'
+        self.stubber = Stubber(self.handler.ses_client)
+        self.stubber.activate()
+        self.addCleanup(self.stubber.deactivate)
+
+    def tearDown(self):
+        self.stubber.assert_no_pending_responses()
+
+    def test_groups_submissions_by_sender(self):
+        default = _form_data()
+        other = dict(_form_data(), from_email='sales@example.com')
+        self.stubber.add_response(
+            'send_bulk_templated_email', _bulk_response('Success', 'Success'),
+            _bulk_params('Contact Form <noreply@example.com>', 2))
+        self.stubber.add_response(
+            'send_bulk_templated_email', _bulk_response('Success'),
+            _bulk_params('Contact Form <sales@example.com>', 1))
+
+        results = self.handler.send_bulk_form_emails([default, other, default])
+
+        self.assertEqual([r['email_id'] for r in results], ['bulk-0', 'bulk-0', 'bulk-1'])
+
+    def test_splits_large_batches_into_chunks_of_50(self):
+        self.stubber.add_response(
+            'send_bulk_templated_email', _bulk_response(*['Success'] * 50),
+            _bulk_params('Contact Form <noreply@example.com>', 50))
+        self.stubber.add_response(
+            'send_bulk_templated_email', _bulk_response('Success'),
+            _bulk_params('Contact Form <noreply@example.com>', 1))
+
+        results = self.handler.send_bulk_form_emails([_form_data()] * 51)
+
+        self.assertTrue(all(r['success'] for r in results))
+
+    def test_sends_reply_to_submissions_individually(self):
+        self.stubber.add_response('send_email', {'MessageId': 'single'}, {
+            'Source': 'Contact Form <noreply@example.com>',
+            'Destination': {'ToAddresses': ['owner@example.com']},
+            'Message': ANY,
+            'ReplyToAddresses': ['jane@example.com']
+        })
+        self.stubber.add_response(
+            'send_bulk_templated_email', _bulk_response('Success'),
+            _bulk_params('Contact Form <noreply@example.com>', 1))
+
+        results = self.handler.send_bulk_form_emails([_form_data(email='jane@example.com'), _form_data()])
+
+        self.assertEqual([r['email_id'] for r in results], ['single', 'bulk-0'])
+
+    def test_reports_per_destination_failures(self):
+        self.stubber.add_response(
+            'send_bulk_templated_email', _bulk_response('Success', 'MessageRejected'),
+            _bulk_params('Contact Form <noreply@example.com>', 2))
+
+        results = self.handler.send_bulk_form_emails([_form_data(), _form_data()])
+
+        self.assertEqual([r['success'] for r in results], [True, False])
+        self.assertIn('MessageRejected', results[1]['error'])
+
+    def test_malformed_submission_only_fails_itself(self):
+        self.stubber.add_response('send_email', {'MessageId': 'single'}, {
+            'Source': ANY, 'Destination': ANY, 'Message': ANY, 'ReplyToAddresses': ['jane@example.com']
+        })
+        self.stubber.add_response(
+            'send_bulk_templated_email', _bulk_response('Success', 'Success'),
+            _bulk_params('Contact Form <noreply@example.com>', 2))
+
+        results = self.handler.send_bulk_form_emails([
+            _form_data(email='jane@example.com'),
+            'not a submission',
+            _form_data(email=5),
+            _form_data()
+        ])
+
+        self.assertEqual([r['success'] for r in results], [True, False, True, True])
+
+    def test_missing_template_falls_back_to_individual_sends(self):
+        self.stubber.add_client_error('send_bulk_templated_email', 'TemplateDoesNotExist')
+        self.stubber.add_response('send_email', {'MessageId': 'first'})
+        self.stubber.add_response('send_email', {'MessageId': 'second'})
+
+        results = self.handler.send_bulk_form_emails([_form_data(), _form_data()])
+
+        self.assertEqual([r['email_id'] for r in results], ['first', 'second'])
+
+    def test_sends_individually_without_a_template(self):
+        self.handler.bulk_template_name = None
+        self.stubber.add_response('send_email', {'MessageId': 'single'})
+
+        results = self.handler.send_bulk_form_emails([_form_data()])
+
+        self.assertEqual(results[0]['email_id'], 'single')
+
+
+class GenerateSubjectTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = EmailHandler()
+
+    def test_uses_source_url_host(self):
+        subject = self.handler._generate_subject({'name': 'Jane'}, {'source_url': 'https://shop.example.com/contact'})
+
+        self.assertEqual(subject, 'New Form Submission from Jane via shop.example.com')
+
+    def test_falls_back_for_unparseable_source_url(self):
+        for source_url in ('http://[bad', [], None, ''):
+            subject = self.handler._generate_subject({'name': 'Jane'}, {'source_url': source_url})
+
+            self.assertEqual(subject, 'New Form Submission from Jane via your website')
+
+    def test_uses_form_subject(self):
+        subject = self.handler._generate_subject({'name': 'Jane'}, {'subject': 'Quote request'})
+
+        self.assertEqual(subject, 'Quote request')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from app.utils.validation import validate_email
+
+
+class ValidateEmailTest(unittest.TestCase):
+    def test_accepts_valid_addresses(self):
+        for email in (
+            'jane@example.com',
+            'jane.doe+forms@mail.example.co.uk',
+            "o'brien@example.com",
+            '"jane doe"@example.com',
+            'jane@my-site.example.com',
+            'jane@xn--bcher-kva.example',
+            'jane@example.xn--p1ai'
+        ):
+            self.assertTrue(validate_email(email), email)
+
+    def test_rejects_malformed_addresses(self):
+        for email in (
+            '',
+            'jane',
+            'jane@example',
+            '@example.com',
+            'jane@',
+            'jane doe@example.com',
+            '.jane@example.com',
+            'jane..doe@example.com',
+            'Jane <jane@example.com>',
+            'jane@example.com, joe@example.com'
+        ):
+            self.assertFalse(validate_email(email), email)
+
+    def test_rejects_invalid_domains(self):
+        for email in (
+            'a@b/c.com',
+            'a@b.com\\',
+            'a@b_c.com',
+            'a@[1.2.3.4]',
+            'a@b.1',
+            'a@-b.com',
+            'a@b-.com',
+            'a@b..com',
+            'a@b.c'
+        ):
+            self.assertFalse(validate_email(email), email)
+
+    def test_rejects_unsafe_quoted_local_parts(self):
+        for email in ('"x>"@evil.com', '"x<y"@example.com', '""@example.com'):
+            self.assertFalse(validate_email(email), email)
+
+    def test_rejects_control_and_non_ascii_characters(self):
+        for email in ('a\x00@b.com', 'a@b\x00.com', '"a\tb"@b.com', 'ü@b.com', 'a@bü.com'):
+            self.assertFalse(validate_email(email), email)
+
+    def test_rejects_non_strings_and_oversized_addresses(self):
+        for email in (None, 5, ['jane@example.com'], 'a' * 310 + '@example.com'):
+            self.assertFalse(validate_email(email), email)
+
+
+if __name__ == '__main__':
+    unittest.main()